@@ -5,7 +5,11 @@ import joblib
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
+import os
 import time
+from partitioned_data import (PARTITION_ROOT, list_partitions, partial_aggregate,
+                              aggregate_partitions, duration_median)
+from inference_pool import InferenceScheduler
 
 # Page configuration with custom theme
 st.set_page_config(
@@ -70,16 +74,44 @@ def load_vacancy_model():
 def load_vehicle_type_model():
     return joblib.load('xgb_vehicle_type_model.pkl')
 
+@st.cache_resource
+def load_inference_pool():
+    # One scheduler per process, shared by every session; each model needs
+    # at least one core of the budget
+    pool = InferenceScheduler(thread_budget=max(os.cpu_count() or 1, 2))
+    pool.register('vacancy', load_vacancy_model())
+    pool.register('vehicle_type', load_vehicle_type_model())
+    return pool
+
+@st.cache_data
+def load_week_forecast(duration):
+    # Score all 7x24 slots with one batched call per model
+    grid = pd.MultiIndex.from_product([range(7), range(24)], names=['DayOfWeek', 'Entry_Hour']).to_frame(index=False)
+    grid['Is_Weekend'] = (grid['DayOfWeek'] >= 5).astype(int)
+    grid['Hour_Bin'] = pd.cut(grid['Entry_Hour'], bins=[0, 6, 9, 12, 17, 20, 24], labels=False, right=False)
+    grid['Duration'] = duration
+    
+    vacancy_future = inference_pool.submit('vacancy', grid[["Entry_Hour", "DayOfWeek", "Is_Weekend", "Hour_Bin"]])
+    vehicle_future = inference_pool.submit('vehicle_type', grid[["Entry_Hour", "Duration", "DayOfWeek", "Is_Weekend", "Hour_Bin"]])
+    grid['Vacancy_Prob'] = vacancy_future.result()[1][:, 1]
+    grid['Two_Wheeler_Prob'] = vehicle_future.result()[1][:, 1]
+    return grid
+
 @st.cache_data
-def load_parking_data():
+def load_parking_stats(partitions):
+    # Prefer lot/month partitions; fall back to the single preprocessed CSV.
+    # `partitions` holds (path, mtime) pairs so that new or replaced part
+    # files change the cache key and trigger a fresh map-reduce.
+    if partitions:
+        return aggregate_partitions([path for path, _ in partitions])
     try:
-        return pd.read_csv('preprocessed_parking_data.csv')
+        return partial_aggregate(pd.read_csv('preprocessed_parking_data.csv'))
     except:
         return None
 
-vacancy_model = load_vacancy_model()
-vehicle_type_model = load_vehicle_type_model()
-parking_data = load_parking_data()
+inference_pool = load_inference_pool()
+parking_stats = load_parking_stats(tuple((path, os.path.getmtime(path))
+                                         for path in list_partitions(PARTITION_ROOT)))
 
 
 # Header with emoji and styling
@@ -105,6 +137,11 @@ with st.sidebar:
         st.info("🔄 Dashboard will refresh every 5 seconds")
         time.sleep(5)
         st.rerun()
+    
+    with st.expander("⚙️ Inference Stats"):
+        pool_stats = inference_pool.stats()
+        st.caption(f"Requests: {pool_stats['submitted']} · Coalesced: {pool_stats['coalesced']} · In flight: {pool_stats['in_flight']}")
+        st.caption(f"Queue wait p50/p95/p99: {pool_stats['queue_p50_ms']:.1f} / {pool_stats['queue_p95_ms']:.1f} / {pool_stats['queue_p99_ms']:.1f} ms")
 
 # Main Dashboard Page
 if page == "🏠 Main Dashboard":
@@ -190,14 +227,13 @@ if page == "🏠 Main Dashboard":
     if predict_button or 'predictions_made' in st.session_state:
         st.session_state.predictions_made = True
         
-        # Make predictions
-        vacancy_pred = vacancy_model.predict(vacancy_features)[0]
-        vehicle_pred = vehicle_type_model.predict(vehicle_features)[0]
-        
-        # Get probabilities if enabled
-        if show_probabilities:
-            vacancy_proba = vacancy_model.predict_proba(vacancy_features)[0]
-            vehicle_proba = vehicle_type_model.predict_proba(vehicle_features)[0]
+        # Make predictions through the shared scheduler
+        vacancy_future = inference_pool.submit('vacancy', vacancy_features)
+        vehicle_future = inference_pool.submit('vehicle_type', vehicle_features)
+        vacancy_pred, vacancy_proba = vacancy_future.result()
+        vehicle_pred, vehicle_proba = vehicle_future.result()
+        vacancy_pred, vacancy_proba = vacancy_pred[0], vacancy_proba[0]
+        vehicle_pred, vehicle_proba = vehicle_pred[0], vehicle_proba[0]
         
         vacancy_status = "Vacant" if vacancy_pred == 1 else "Occupied"
         vehicle_type = "Two Wheeler" if vehicle_pred == 1 else "Four Wheeler"
@@ -295,30 +331,72 @@ if page == "🏠 Main Dashboard":
             st.metric("💰 Estimated Parking Fee", 
                      f"₹{estimated_fee:.2f}",
                      delta=f"₹{fee_per_hour}/hr")
+    
+    # Day-ahead forecast for every hour, scored in one batch
+    st.markdown("---")
+    st.markdown("### 📆 Day-Ahead Forecast")
+    st.markdown(f'<div class="info-box">Predicted probabilities for every hour, using a parking duration of {hours}h {minutes}m</div>', unsafe_allow_html=True)
+    
+    day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+    week_forecast = load_week_forecast(duration)
+    forecast_view = st.radio("Forecast View", ["📈 Day Curve", "🗓️ Week Grid"], horizontal=True)
+    
+    if forecast_view == "📈 Day Curve":
+        forecast_day = st.selectbox("Forecast Day", options=list(range(7)), index=day_of_week,
+                                    format_func=lambda x: day_names[x])
+        day_forecast = week_forecast[week_forecast['DayOfWeek'] == forecast_day]
+        
+        fig_forecast = go.Figure()
+        fig_forecast.add_trace(go.Scatter(x=day_forecast['Entry_Hour'], y=day_forecast['Vacancy_Prob'] * 100,
+                                          mode='lines+markers', name='Vacancy', line=dict(color='#2ecc71')))
+        fig_forecast.add_trace(go.Scatter(x=day_forecast['Entry_Hour'], y=day_forecast['Two_Wheeler_Prob'] * 100,
+                                          mode='lines+markers', name='Two Wheeler', line=dict(color='orange')))
+        fig_forecast.update_layout(title=f'Hourly Forecast for {day_names[forecast_day]}',
+                                   xaxis_title='Hour of Day', yaxis_title='Probability (%)',
+                                   yaxis_range=[0, 100], height=400)
+        st.plotly_chart(fig_forecast, use_container_width=True)
+        
+        best_hour = day_forecast.loc[day_forecast['Vacancy_Prob'].idxmax()]
+        st.info(f"✅ **Best Hour to Park:** {int(best_hour['Entry_Hour'])}:00 with {best_hour['Vacancy_Prob'] * 100:.1f}% vacancy probability")
+    else:
+        grid_metric = st.selectbox("Probability", ["Vacancy_Prob", "Two_Wheeler_Prob"],
+                                   format_func=lambda x: "Vacancy" if x == "Vacancy_Prob" else "Two Wheeler")
+        grid_pivot = week_forecast.pivot(index='DayOfWeek', columns='Entry_Hour', values=grid_metric) * 100
+        grid_pivot.index = [day_names[i][:3] for i in grid_pivot.index]
+        
+        fig_grid = px.imshow(grid_pivot,
+                             labels=dict(x="Hour of Day", y="Day of Week", color="Probability (%)"),
+                             x=grid_pivot.columns,
+                             y=grid_pivot.index,
+                             color_continuous_scale='RdYlGn',
+                             zmin=0, zmax=100,
+                             aspect="auto")
+        fig_grid.update_layout(height=400)
+        st.plotly_chart(fig_grid, use_container_width=True)
 
 # Analytics Page
 elif page == "📊 Analytics":
     st.markdown("### 📊 Parking Analytics Dashboard")
     
-    if parking_data is not None:
+    if parking_stats is not None:
         st.markdown('<div class="info-box">📈 Analyzing historical parking data patterns</div>', unsafe_allow_html=True)
         
         # Key metrics
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("📝 Total Records", f"{len(parking_data):,}")
+            st.metric("📝 Total Records", f"{parking_stats['count']:,}")
         
         with col2:
-            two_wheeler_pct = (parking_data['Type of Vehicle_Two Wheeler'].sum() / len(parking_data)) * 100
+            two_wheeler_pct = (parking_stats['two_wheeler'] / parking_stats['count']) * 100
             st.metric("🏍️ Two Wheelers", f"{two_wheeler_pct:.1f}%")
         
         with col3:
-            avg_duration = parking_data['Duration'].mean()
+            avg_duration = parking_stats['duration_sum'] / parking_stats['count']
             st.metric("⏱️ Avg Duration", f"{avg_duration:.0f} min")
         
         with col4:
-            weekend_pct = (parking_data['Is_Weekend'].sum() / len(parking_data)) * 100
+            weekend_pct = (parking_stats['weekend'] / parking_stats['count']) * 100
             st.metric("🎉 Weekend Parking", f"{weekend_pct:.1f}%")
         
         st.markdown("---")
@@ -328,7 +406,7 @@ elif page == "📊 Analytics":
         
         with tab1:
             # Hourly distribution
-            hourly_data = parking_data.groupby('Entry_Hour').size().reset_index(name='Count')
+            hourly_data = parking_stats['hourly'].rename_axis('Entry_Hour').reset_index(name='Count')
             fig_hourly = px.bar(hourly_data, x='Entry_Hour', y='Count',
                                title='Parking Entries by Hour of Day',
                                labels={'Entry_Hour': 'Hour', 'Count': 'Number of Vehicles'},
@@ -344,7 +422,7 @@ elif page == "📊 Analytics":
         with tab2:
             # Weekly pattern
             day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            weekly_data = parking_data.groupby('DayOfWeek').size().reset_index(name='Count')
+            weekly_data = parking_stats['weekly'].rename_axis('DayOfWeek').reset_index(name='Count')
             weekly_data['Day'] = weekly_data['DayOfWeek'].apply(lambda x: day_names[x])
             
             fig_weekly = px.line(weekly_data, x='Day', y='Count',
@@ -361,8 +439,8 @@ elif page == "📊 Analytics":
             # Vehicle type distribution
             vehicle_counts = pd.DataFrame({
                 'Vehicle Type': ['Two Wheeler', 'Four Wheeler'],
-                'Count': [parking_data['Type of Vehicle_Two Wheeler'].sum(), 
-                         len(parking_data) - parking_data['Type of Vehicle_Two Wheeler'].sum()]
+                'Count': [parking_stats['two_wheeler'], 
+                         parking_stats['count'] - parking_stats['two_wheeler']]
             })
             
             fig_vehicle = px.pie(vehicle_counts, values='Count', names='Vehicle Type',
@@ -374,7 +452,8 @@ elif page == "📊 Analytics":
         
         with tab4:
             # Duration analysis
-            fig_duration = px.histogram(parking_data, x='Duration',
+            duration_counts = parking_stats['durations'].rename_axis('Duration').reset_index(name='Count')
+            fig_duration = px.histogram(duration_counts, x='Duration', y='Count', histfunc='sum',
                                        title='Parking Duration Distribution',
                                        labels={'Duration': 'Duration (minutes)', 'count': 'Frequency'},
                                        color_discrete_sequence=['#9b59b6'],
@@ -384,11 +463,11 @@ elif page == "📊 Analytics":
             
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("📊 Median Duration", f"{parking_data['Duration'].median():.0f} min")
+                st.metric("📊 Median Duration", f"{duration_median(parking_stats['durations']):.0f} min")
             with col2:
-                st.metric("⬆️ Max Duration", f"{parking_data['Duration'].max():.0f} min")
+                st.metric("⬆️ Max Duration", f"{parking_stats['durations'].index.max():.0f} min")
             with col3:
-                st.metric("⬇️ Min Duration", f"{parking_data['Duration'].min():.0f} min")
+                st.metric("⬇️ Min Duration", f"{parking_stats['durations'].index.min():.0f} min")
     else:
         st.warning("⚠️ No parking data available for analytics")
 
@@ -396,14 +475,14 @@ elif page == "📊 Analytics":
 elif page == "📈 Insights":
     st.markdown("### 📈 Business Insights & Recommendations")
     
-    if parking_data is not None:
+    if parking_stats is not None:
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("#### 🎯 Key Findings")
             
             # Peak hours
-            hourly_counts = parking_data.groupby('Entry_Hour').size()
+            hourly_counts = parking_stats['hourly']
             peak_hours = hourly_counts.nlargest(3)
             
             st.markdown("**🔥 Peak Hours:**")
@@ -411,15 +490,15 @@ elif page == "📈 Insights":
                 st.markdown(f"- **{int(hour)}:00** - {int(count)} entries")
             
             # Weekend vs Weekday
-            weekend_avg = parking_data[parking_data['Is_Weekend'] == 1].groupby('Entry_Hour').size().mean()
-            weekday_avg = parking_data[parking_data['Is_Weekend'] == 0].groupby('Entry_Hour').size().mean()
+            weekend_avg = parking_stats['weekend_hourly'].mean()
+            weekday_avg = parking_stats['weekday_hourly'].mean()
             
             st.markdown(f"\n**📅 Average Hourly Entries:**")
             st.markdown(f"- Weekdays: {weekday_avg:.1f} vehicles/hour")
             st.markdown(f"- Weekends: {weekend_avg:.1f} vehicles/hour")
             
             # Vehicle preference
-            two_wheeler_ratio = parking_data['Type of Vehicle_Two Wheeler'].mean()
+            two_wheeler_ratio = parking_stats['two_wheeler'] / parking_stats['count']
             st.markdown(f"\n**🏍️ Vehicle Preference:**")
             st.markdown(f"- Two Wheelers: {two_wheeler_ratio*100:.1f}%")
             st.markdown(f"- Four Wheelers: {(1-two_wheeler_ratio)*100:.1f}%")
@@ -454,7 +533,7 @@ elif page == "📈 Insights":
         st.markdown("---")
         st.markdown("#### 🔥 Parking Activity Heatmap")
         
-        heatmap_data = parking_data.groupby(['DayOfWeek', 'Entry_Hour']).size().reset_index(name='Count')
+        heatmap_data = parking_stats['heatmap'].rename_axis(['DayOfWeek', 'Entry_Hour']).reset_index(name='Count')
         heatmap_pivot = heatmap_data.pivot(index='DayOfWeek', columns='Entry_Hour', values='Count').fillna(0)
         
         day_names = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
@@ -0,0 +1,306 @@
+"""
+Evaluation harness for the vacancy and vehicle type models.
+
+For each model file this measures:
+- parallel stratified k-fold cross-validation (accuracy, log-loss, Brier
+  score and expected calibration error on out-of-fold probabilities)
+- serving cost: file size, load time, single-row and batch inference latency
+
+Results are written as one JSON report per model version under `reports/`.
+When a deployed version is given, each candidate is compared against it and
+the script exits with status 1 if a model got slower or larger without
+getting more accurate, so it can gate a model promotion. Nothing is compared
+against stored numbers: the deployed model is cross-validated again on the
+same data as the candidate, and its file is timed interleaved with the
+candidate in the same process, so data changes and machine load affect both
+equally. Each report records a fingerprint of the data it was scored on.
+
+Usage:
+    python evaluate_models.py --version v1
+    python evaluate_models.py --version v2 --model-dir candidate/ --deployed v1
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, brier_score_loss, log_loss
+from sklearn.model_selection import StratifiedKFold, cross_val_predict
+
+from retrain_models import VACANCY_FEATURES, VEHICLE_FEATURES, create_vacancy_labels
+
+REPORT_DIR = 'reports'
+
+MODELS = {
+    'vacancy': {
+        'path': 'xgb_parking_vacancy_model.pkl',
+        'features': VACANCY_FEATURES,
+        'target': 'Vacancy',
+    },
+    'vehicle_type': {
+        'path': 'xgb_vehicle_type_model.pkl',
+        'features': VEHICLE_FEATURES,
+        'target': 'Type of Vehicle_Two Wheeler',
+    },
+}
+
+# Relative latency increase tolerated without an accuracy gain
+COST_TOLERANCE = 0.10
+# Share of interleaved rounds the candidate must lose before it counts as slower
+SLOWER_ROUND_SHARE = 0.9
+# Minimum log-loss improvement that counts as "more accurate"
+MIN_LOG_LOSS_GAIN = 0.001
+# Minimum accuracy improvement that counts as "more accurate"; the gain must
+# also exceed the deployed model's fold-to-fold spread
+MIN_ACCURACY_GAIN = 0.005
+
+
+def expected_calibration_error(y_true, proba, bins=10):
+    """Weighted mean gap between predicted probability and observed rate."""
+    edges = np.linspace(0, 1, bins + 1)
+    which = np.clip(np.digitize(proba, edges[1:-1]), 0, bins - 1)
+    error = 0.0
+    for b in range(bins):
+        mask = which == b
+        if mask.any():
+            error += mask.mean() * abs(proba[mask].mean() - y_true[mask].mean())
+    return float(error)
+
+
+def cross_validate_model(model, X, y, folds=5, n_jobs=-1, seed=42):
+    """Out-of-fold metrics for the model's configuration, folds run in parallel."""
+    # One XGBoost thread per fold so parallel folds don't oversubscribe cores
+    estimator = clone(model).set_params(n_jobs=1)
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed)
+    proba = cross_val_predict(estimator, X, y, cv=splitter, n_jobs=n_jobs, method='predict_proba')[:, 1]
+    pred = (proba >= 0.5).astype(int)
+
+    fold_accuracy = [accuracy_score(y[test], pred[test]) for _, test in splitter.split(X, y)]
+    return {
+        'folds': folds,
+        'accuracy': float(accuracy_score(y, pred)),
+        'accuracy_std': float(np.std(fold_accuracy)),
+        'log_loss': float(log_loss(y, proba)),
+        'brier': float(brier_score_loss(y, proba)),
+        'ece': expected_calibration_error(y, proba),
+    }
+
+
+def measure_serving_cost(path, X, repeats=200, batch_rows=1000, loads=5):
+    """File size, load time and single-row/batch latency of a saved model."""
+    load_ms = []
+    for _ in range(loads):
+        start = time.perf_counter()
+        model = joblib.load(path)
+        load_ms.append((time.perf_counter() - start) * 1000)
+
+    row = X.iloc[[0]]
+    model.predict_proba(row)  # warm-up
+    single_ms = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict_proba(row)
+        single_ms.append((time.perf_counter() - start) * 1000)
+
+    batch = X.sample(n=batch_rows, replace=len(X) < batch_rows, random_state=0)
+    batch_ms = []
+    for _ in range(max(1, repeats // 20)):
+        start = time.perf_counter()
+        model.predict_proba(batch)
+        batch_ms.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'file_size_bytes': os.path.getsize(path),
+        'load_ms': float(np.median(load_ms)),
+        'single_row_p50_ms': float(np.percentile(single_ms, 50)),
+        'single_row_p95_ms': float(np.percentile(single_ms, 95)),
+        'batch_rows': batch_rows,
+        'batch_ms': float(np.median(batch_ms)),
+    }
+
+
+def _block_min_ms(model, X, calls):
+    """Fastest of `calls` predict_proba calls, in ms."""
+    best = float('inf')
+    for _ in range(calls):
+        start = time.perf_counter()
+        model.predict_proba(X)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def compare_latency(candidate_path, deployed_path, X, rounds=30, calls=20, batch_rows=1000):
+    """Time both model files in alternating rounds within this process.
+
+    Each round takes the fastest of `calls` runs per model, alternating which
+    model goes first, and records the candidate/deployed ratio. A model only
+    counts as slower if the median ratio is above the tolerance and it lost
+    nearly every round, so an identical model never fails on timing noise."""
+    models = {'candidate': joblib.load(candidate_path), 'deployed': joblib.load(deployed_path)}
+    inputs = {
+        'single_row': X.iloc[[0]],
+        'batch': X.sample(n=batch_rows, replace=len(X) < batch_rows, random_state=0),
+    }
+    for model in models.values():
+        for data in inputs.values():
+            model.predict_proba(data)  # warm-up
+
+    ratios = {kind: [] for kind in inputs}
+    for i in range(rounds):
+        order = ['candidate', 'deployed'] if i % 2 == 0 else ['deployed', 'candidate']
+        for kind, data in inputs.items():
+            timings = {role: _block_min_ms(models[role], data, calls) for role in order}
+            ratios[kind].append(timings['candidate'] / timings['deployed'])
+
+    comparison = {}
+    for kind, values in ratios.items():
+        values = np.array(values)
+        comparison[kind] = {
+            'median_ratio': float(np.median(values)),
+            'slower_share': float((values > 1).mean()),
+        }
+    return comparison
+
+
+def model_data(name, df):
+    """Feature frame and integer target for one model."""
+    spec = MODELS[name]
+    return df[spec['features']], df[spec['target']].astype(int).to_numpy()
+
+
+def data_fingerprint(X, y):
+    """Hash of the features and target a model was scored on."""
+    digest = hashlib.sha256(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    digest.update(np.ascontiguousarray(y).tobytes())
+    return digest.hexdigest()
+
+
+def evaluate_model(name, df, version, model_dir='.', folds=5, n_jobs=-1):
+    """Build the report for the model file of one version."""
+    path = os.path.join(model_dir, MODELS[name]['path'])
+    X, y = model_data(name, df)
+    return {
+        'model': name,
+        'version': version,
+        'path': path,
+        'evaluated_at': datetime.now().isoformat(timespec='seconds'),
+        'rows': len(df),
+        'data_sha256': data_fingerprint(X, y),
+        'metrics': cross_validate_model(joblib.load(path), X, y, folds=folds, n_jobs=n_jobs),
+        'serving': measure_serving_cost(path, X),
+    }
+
+
+def report_path(name, version, report_dir=REPORT_DIR):
+    return os.path.join(report_dir, f'{name}-{version}.json')
+
+
+def save_report(report, report_dir=REPORT_DIR):
+    os.makedirs(report_dir, exist_ok=True)
+    path = report_path(report['model'], report['version'], report_dir)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def load_report(name, version, report_dir=REPORT_DIR):
+    with open(report_path(name, version, report_dir)) as f:
+        return json.load(f)
+
+
+def promotion_blockers(candidate, deployed, latency, tolerance=COST_TOLERANCE):
+    """Reasons the candidate should not replace the deployed version, given
+    the candidate report, the deployed model's metrics and file size measured
+    on the same data, and a `compare_latency` result. A model that is slower
+    or larger must also be more accurate."""
+    accuracy_margin = max(MIN_ACCURACY_GAIN, deployed['metrics']['accuracy_std'])
+    more_accurate = (
+        candidate['metrics']['log_loss'] <= deployed['metrics']['log_loss'] - MIN_LOG_LOSS_GAIN
+        or candidate['metrics']['accuracy'] >= deployed['metrics']['accuracy'] + accuracy_margin
+    )
+    if more_accurate:
+        return []
+
+    blockers = []
+    for kind, label in (('single_row', 'single-row latency'), ('batch', 'batch latency')):
+        ratio, share = latency[kind]['median_ratio'], latency[kind]['slower_share']
+        if ratio > 1 + tolerance and share >= SLOWER_ROUND_SHARE:
+            blockers.append(f"{label} {ratio:.2f}x the deployed model in {share:.0%} of rounds "
+                            f"without an accuracy gain")
+    # File size is deterministic, so any growth counts
+    new, old = candidate['serving']['file_size_bytes'], deployed['serving']['file_size_bytes']
+    if new > old:
+        blockers.append(f"file size {new} vs {old} bytes without an accuracy gain")
+    return blockers
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Evaluate model accuracy and serving cost.')
+    parser.add_argument('--version', required=True, help='Version label for the reports')
+    parser.add_argument('--model-dir', default='.', help='Directory holding the model files to evaluate')
+    parser.add_argument('--deployed', help='Deployed version to compare against')
+    parser.add_argument('--deployed-dir', help='Directory holding the deployed model files '
+                                               '(default: the path in the deployed report)')
+    parser.add_argument('--data', default='preprocessed_parking_data.csv', help='Preprocessed parking CSV')
+    parser.add_argument('--folds', type=int, default=5, help='Cross-validation folds')
+    parser.add_argument('--jobs', type=int, default=-1, help='Parallel fold workers')
+    parser.add_argument('--report-dir', default=REPORT_DIR, help='Directory for JSON reports')
+    args = parser.parse_args()
+
+    print("Loading preprocessed data...")
+    df = pd.read_csv(args.data)
+    df['Vacancy'] = create_vacancy_labels(df)
+    print(f"✓ Data loaded: {df.shape[0]} rows, {df.shape[1]} columns")
+
+    blocked = False
+    for name in MODELS:
+        print("\n" + "="*60)
+        print(f"EVALUATING {name.upper()} MODEL ({args.version})")
+        print("="*60)
+        report = evaluate_model(name, df, args.version, model_dir=args.model_dir,
+                                folds=args.folds, n_jobs=args.jobs)
+        metrics, serving = report['metrics'], report['serving']
+        print(f"Accuracy: {metrics['accuracy']:.4f} ± {metrics['accuracy_std']:.4f} ({metrics['folds']} folds)")
+        print(f"Log-loss: {metrics['log_loss']:.4f}  Brier: {metrics['brier']:.4f}  ECE: {metrics['ece']:.4f}")
+        print(f"Size: {serving['file_size_bytes'] / 1024:.1f} KB  Load: {serving['load_ms']:.1f} ms")
+        print(f"Single row: {serving['single_row_p50_ms']:.2f} ms (p95 {serving['single_row_p95_ms']:.2f} ms)  "
+              f"Batch of {serving['batch_rows']}: {serving['batch_ms']:.2f} ms")
+        print(f"✓ Report saved as '{save_report(report, args.report_dir)}'")
+
+        if args.deployed:
+            deployed_path = (os.path.join(args.deployed_dir, MODELS[name]['path'])
+                             if args.deployed_dir else load_report(name, args.deployed, args.report_dir)['path'])
+            # Re-score and re-time the deployed model on this data rather than
+            # trusting a report that may come from an older export
+            X, y = model_data(name, df)
+            deployed = {
+                'metrics': cross_validate_model(joblib.load(deployed_path), X, y,
+                                                folds=args.folds, n_jobs=args.jobs),
+                'serving': {'file_size_bytes': os.path.getsize(deployed_path)},
+            }
+            print(f"Deployed '{args.deployed}' on this data: accuracy {deployed['metrics']['accuracy']:.4f}, "
+                  f"log-loss {deployed['metrics']['log_loss']:.4f}")
+            latency = compare_latency(report['path'], deployed_path, X)
+            print(f"Latency vs '{args.deployed}': single row {latency['single_row']['median_ratio']:.2f}x, "
+                  f"batch {latency['batch']['median_ratio']:.2f}x")
+            blockers = promotion_blockers(report, deployed, latency)
+            if blockers:
+                blocked = True
+                print(f"✗ Promotion blocked against '{args.deployed}':")
+                for reason in blockers:
+                    print(f"  - {reason}")
+            else:
+                print(f"✓ OK to promote over '{args.deployed}'")
+
+    sys.exit(1 if blocked else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Excel ingestion with a one-time conversion to a columnar cache.
+
+Weekly site exports arrive as .xlsx workbooks. Parsing them is far slower than
+reading CSV, so each workbook is streamed once with openpyxl in read-only mode,
+normalized to the same schema as `parking_data_.csv` and written to a Parquet
+file named after the workbook's content hash. Later loads of the same file
+read the Parquet cache directly.
+
+Usage:
+    python excel_ingest.py parking_data_123.csv.xlsx --csv parking_data_.csv
+"""
+import argparse
+import datetime
+import hashlib
+import os
+
+import openpyxl
+import pandas as pd
+
+CACHE_DIR = '.parking_cache'
+
+# Schema of parking_data_.csv
+RAW_COLUMNS = ['Type of Vehicle', 'Vehicle Number', 'Vehicle Entering Time',
+               'Departure Time', 'Date', 'Vehicle Owner Name']
+TIME_COLUMNS = {'Vehicle Entering Time', 'Departure Time'}
+DATE_COLUMNS = {'Date'}
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """SHA-256 of the file contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _format_cell(value, column):
+    """Render a cell the way it appears in parking_data_.csv."""
+    if value is None:
+        return None
+    if column in TIME_COLUMNS and isinstance(value, (datetime.time, datetime.datetime)):
+        return value.strftime('%H:%M:%S')
+    if column in DATE_COLUMNS and isinstance(value, (datetime.date, datetime.datetime)):
+        return value.strftime('%d-%m-%Y')
+    return str(value).strip()
+
+
+def stream_sheet_rows(worksheet):
+    """Yield normalized rows from one worksheet, checking its header."""
+    rows = worksheet.iter_rows(values_only=True)
+    header = [str(cell).strip() if cell is not None else None for cell in next(rows, ())]
+    missing = [column for column in RAW_COLUMNS if column not in header]
+    if missing:
+        raise ValueError(f"Sheet '{worksheet.title}' is missing columns: {missing}")
+    positions = [header.index(column) for column in RAW_COLUMNS]
+    for row in rows:
+        if row is None or all(cell is None for cell in row):
+            continue
+        yield tuple(_format_cell(row[i] if i < len(row) else None, column)
+                    for i, column in zip(positions, RAW_COLUMNS))
+
+
+def read_excel_records(path, sheets=None):
+    """Stream the given sheets (default: all) of a workbook into a frame with
+    the parking_data_.csv schema. Sheets that are exact copies of a sheet
+    already read are skipped."""
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        records = []
+        seen = set()
+        for worksheet in workbook.worksheets:
+            if sheets is not None and worksheet.title not in sheets:
+                continue
+            sheet_rows = list(stream_sheet_rows(worksheet))
+            digest = hashlib.sha256(repr(sheet_rows).encode('utf-8')).hexdigest()
+            if digest in seen:
+                continue
+            seen.add(digest)
+            records.extend(sheet_rows)
+    finally:
+        workbook.close()
+    return pd.DataFrame.from_records(records, columns=RAW_COLUMNS)
+
+
+def load_excel(path, cache_dir=CACHE_DIR, sheets=None):
+    """Return the normalized records of a workbook, converting it to the
+    Parquet cache on first use."""
+    key = file_hash(path)
+    if sheets is not None:
+        key += '-' + hashlib.sha256('\n'.join(sorted(sheets)).encode('utf-8')).hexdigest()[:12]
+    cache_path = os.path.join(cache_dir, f'{key}.parquet')
+    if os.path.isfile(cache_path):
+        return pd.read_parquet(cache_path)
+
+    df = read_excel_records(path, sheets=sheets)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write then rename so a concurrent reader never sees a partial file
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, cache_path)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ingest an Excel parking export through the columnar cache.')
+    parser.add_argument('source', help='Excel workbook (.xlsx)')
+    parser.add_argument('--sheet', action='append', dest='sheets', help='Sheet to read (repeatable, default: all)')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='Directory for cached Parquet files')
+    parser.add_argument('--csv', help='Also write the records to this CSV path')
+    args = parser.parse_args()
+
+    print(f"Loading {args.source}...")
+    df = load_excel(args.source, cache_dir=args.cache_dir, sheets=args.sheets)
+    print(f"✓ Data loaded: {df.shape[0]} rows, {df.shape[1]} columns")
+    if args.csv:
+        df.to_csv(args.csv, index=False)
+        print(f"✓ Records saved as '{args.csv}'")
+
+
+if __name__ == "__main__":
+    main()
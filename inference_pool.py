@@ -0,0 +1,130 @@
+"""
+Shared in-process inference scheduler for the dashboard models.
+
+All Streamlit sessions run in one process and share the cached model objects.
+Calling `predict` directly from every script thread lets each call start its
+own XGBoost thread pool, which oversubscribes the cores under load. The
+scheduler instead gives every model a fixed share of a global thread budget:
+
+- each model gets its own worker threads and its XGBoost `n_jobs` is pinned
+  to its share, so concurrent sessions queue instead of fighting for cores
+- identical requests that are already queued or running share one result
+- queue wait and run times are recorded and exposed through `stats()`
+"""
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Number of recent requests kept for latency percentiles
+LATENCY_WINDOW = 1000
+
+
+class InferenceScheduler:
+    def __init__(self, thread_budget=None):
+        self.thread_budget = thread_budget or os.cpu_count() or 1
+        self._models = {}
+        self._threads = {}
+        self._executors = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._queue_ms = deque(maxlen=LATENCY_WINDOW)
+        self._run_ms = deque(maxlen=LATENCY_WINDOW)
+        self._submitted = 0
+        self._coalesced = 0
+
+    def register(self, name, model, workers=1, threads=None):
+        """Add a model under `name`, served by `workers` threads that each
+        let XGBoost use `threads` cores. Models registered without `threads`
+        split whatever budget the others leave, and are re-split every time a
+        model is added, so `workers * threads` over all models never exceeds
+        `thread_budget`."""
+        plan = dict(self._threads, **{name: (workers, threads)})
+        allocation = self._allocate(plan)
+        self._models[name] = model
+        self._threads = plan
+        self._executors[name] = ThreadPoolExecutor(max_workers=workers,
+                                                   thread_name_prefix=f'inference-{name}')
+        for model_name, n_jobs in allocation.items():
+            self._models[model_name].set_params(n_jobs=n_jobs)
+
+    def threads_per_worker(self):
+        """XGBoost threads each model's workers are pinned to."""
+        return self._allocate(self._threads)
+
+    def submit(self, name, features):
+        """Queue a prediction for a feature frame and return a Future that
+        resolves to `(predictions, probabilities)`. Identical requests that
+        are still in flight share the same Future."""
+        key = (
+            name,
+            features.shape,
+            tuple(features.columns),
+            tuple(str(dtype) for dtype in features.dtypes),
+            pd.util.hash_pandas_object(features, index=False).to_numpy().tobytes(),
+        )
+        with self._lock:
+            self._submitted += 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._coalesced += 1
+                return future
+            future = self._executors[name].submit(self._run, name, features, time.perf_counter())
+            self._in_flight[key] = future
+        future.add_done_callback(lambda _: self._forget(key))
+        return future
+
+    def predict(self, name, features):
+        """Blocking form of `submit`."""
+        return self.submit(name, features).result()
+
+    def stats(self):
+        """Queue and run latency percentiles (ms) over recent requests."""
+        with self._lock:
+            queue_ms = np.array(self._queue_ms)
+            run_ms = np.array(self._run_ms)
+            stats = {
+                'submitted': self._submitted,
+                'coalesced': self._coalesced,
+                'in_flight': len(self._in_flight),
+            }
+        for label, values in (('queue', queue_ms), ('run', run_ms)):
+            for pct in (50, 95, 99):
+                stats[f'{label}_p{pct}_ms'] = float(np.percentile(values, pct)) if len(values) else 0.0
+        return stats
+
+    def shutdown(self):
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
+
+    def _allocate(self, plan):
+        """Map model name to n_jobs for a {name: (workers, threads)} plan,
+        raising ValueError if it cannot fit in the thread budget."""
+        fixed = sum(workers * threads for workers, threads in plan.values() if threads is not None)
+        shared_workers = sum(workers for workers, threads in plan.values() if threads is None)
+        remaining = self.thread_budget - fixed
+        if remaining < 0 or (shared_workers and remaining < shared_workers):
+            raise ValueError(f"Inference plan needs more than the {self.thread_budget}-thread budget")
+        share = remaining // shared_workers if shared_workers else 0
+        return {name: threads if threads is not None else share
+                for name, (workers, threads) in plan.items()}
+
+    def _run(self, name, features, queued_at):
+        started = time.perf_counter()
+        model = self._models[name]
+        # One pass gives both outputs; the label is the most probable class
+        proba = model.predict_proba(features)
+        pred = model.classes_[np.argmax(proba, axis=1)]
+        finished = time.perf_counter()
+        with self._lock:
+            self._queue_ms.append((started - queued_at) * 1000)
+            self._run_ms.append((finished - started) * 1000)
+        return pred, proba
+
+    def _forget(self, key):
+        with self._lock:
+            self._in_flight.pop(key, None)
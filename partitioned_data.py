@@ -0,0 +1,152 @@
+"""
+Partitioned storage and map-reduce aggregation for parking history.
+
+Records are stored under a partition root by lot and month, with one CSV
+part file per ingest so weekly exports add to a month instead of replacing it:
+
+    partitions/lot=<lot>/month=<YYYY-MM>/part-<hash>.csv
+
+Each partition is aggregated independently in a process pool into a partial
+result made only of counts and sums, so partials from any number of lots and
+months can be merged into the statistics shown on the dashboard without ever
+loading the combined history into a single frame.
+
+Usage:
+    python partitioned_data.py preprocessed_parking_data.csv --lot main
+"""
+import argparse
+import glob
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+import pandas as pd
+
+PARTITION_ROOT = 'partitions'
+PART_PATTERN = 'part-*.csv'
+DEFAULT_LOT = 'main'
+
+# Only these columns are needed by the aggregations
+AGGREGATE_COLUMNS = ['Entry_Hour', 'DayOfWeek', 'Is_Weekend', 'Duration', 'Type of Vehicle_Two Wheeler']
+
+
+def write_partitions(df, root=PARTITION_ROOT, lot=DEFAULT_LOT, replace=False):
+    """Split a preprocessed frame by month of its `Date` column and add one
+    part file per month for the given lot. Parts are named after a hash of
+    their contents, so re-ingesting the same export is a no-op. With
+    `replace`, existing parts of the months being written are removed first.
+    Returns the list of written part paths."""
+    months = pd.to_datetime(df['Date'], errors='coerce').dt.strftime('%Y-%m').fillna('unknown')
+    paths = []
+    for month, part in df.groupby(months, sort=True):
+        part_dir = os.path.join(root, f'lot={lot}', f'month={month}')
+        os.makedirs(part_dir, exist_ok=True)
+        if replace:
+            for old_path in glob.glob(os.path.join(part_dir, PART_PATTERN)):
+                os.remove(old_path)
+        content = part.to_csv(index=False)
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+        path = os.path.join(part_dir, f'part-{digest}.csv')
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        paths.append(path)
+    return paths
+
+
+def list_partitions(root=PARTITION_ROOT, lots=None, months=None):
+    """Return every part file path under `root`, optionally filtered by lot
+    and month names."""
+    paths = []
+    if not os.path.isdir(root):
+        return paths
+    for lot_dir in sorted(os.listdir(root)):
+        if not lot_dir.startswith('lot='):
+            continue
+        if lots is not None and lot_dir[len('lot='):] not in lots:
+            continue
+        for month_dir in sorted(os.listdir(os.path.join(root, lot_dir))):
+            if not month_dir.startswith('month='):
+                continue
+            if months is not None and month_dir[len('month='):] not in months:
+                continue
+            paths.extend(sorted(glob.glob(os.path.join(root, lot_dir, month_dir, PART_PATTERN))))
+    return paths
+
+
+def partial_aggregate(df):
+    """Reduce one frame to a mergeable partial result (counts and sums only)."""
+    two_wheeler = df['Type of Vehicle_Two Wheeler'].astype(bool)
+    weekend = df['Is_Weekend'] == 1
+    return {
+        'count': len(df),
+        'two_wheeler': int(two_wheeler.sum()),
+        'weekend': int(weekend.sum()),
+        'duration_sum': float(df['Duration'].sum()),
+        'hourly': df.groupby('Entry_Hour').size(),
+        'weekly': df.groupby('DayOfWeek').size(),
+        'heatmap': df.groupby(['DayOfWeek', 'Entry_Hour']).size(),
+        'weekend_hourly': df[weekend].groupby('Entry_Hour').size(),
+        'weekday_hourly': df[~weekend].groupby('Entry_Hour').size(),
+        # Durations are whole minutes, so exact value counts stay small and
+        # still give an exact median, min, max and histogram after merging
+        'durations': df['Duration'].value_counts(),
+    }
+
+
+def merge_partials(left, right):
+    """Combine two partial results into one."""
+    merged = {}
+    for key, value in left.items():
+        if isinstance(value, pd.Series):
+            merged[key] = value.add(right[key], fill_value=0).astype('int64')
+        else:
+            merged[key] = value + right[key]
+    return merged
+
+
+def aggregate_partition(path):
+    """Map step: load a single part file and reduce it to a partial."""
+    return partial_aggregate(pd.read_csv(path, usecols=AGGREGATE_COLUMNS))
+
+
+def aggregate_partitions(paths, max_workers=None):
+    """Aggregate part files in a process pool and merge the partials.
+    Returns None if there is nothing to aggregate."""
+    if not paths:
+        return None
+    if len(paths) == 1:
+        return aggregate_partition(paths[0])
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        partials = list(pool.map(aggregate_partition, paths))
+    return reduce(merge_partials, partials)
+
+
+def duration_median(durations):
+    """Median of the values described by a value-count Series."""
+    ordered = durations.sort_index()
+    cumulative = ordered.cumsum()
+    total = cumulative.iloc[-1]
+    lower = ordered.index[cumulative.searchsorted((total + 1) // 2)]
+    upper = ordered.index[cumulative.searchsorted(total // 2 + 1)]
+    return (lower + upper) / 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write preprocessed parking data into lot/month partitions.')
+    parser.add_argument('source', help='Preprocessed parking CSV')
+    parser.add_argument('--lot', default=DEFAULT_LOT, help='Lot name for these records')
+    parser.add_argument('--root', default=PARTITION_ROOT, help='Partition root directory')
+    parser.add_argument('--replace', action='store_true', help='Replace existing data for the months being written')
+    args = parser.parse_args()
+
+    print(f"Loading {args.source}...")
+    df = pd.read_csv(args.source)
+    paths = write_partitions(df, root=args.root, lot=args.lot, replace=args.replace)
+    print(f"✓ Wrote {len(paths)} part file(s) for lot '{args.lot}':")
+    for path in paths:
+        print(f"  {path}")
+
+
+if __name__ == "__main__":
+    main()